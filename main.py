@@ -5,6 +5,7 @@ Auto-Healing Pipeline Main Entry Point - FIXED IMPORTS
 import os
 import sys
 import argparse
+import time
 from pathlib import Path
 
 # Add the current directory to Python path
@@ -13,9 +14,13 @@ sys.path.insert(0, str(Path(__file__).parent))
 try:
     from src.healer.project_analyzer import ProjectAnalyzer
     from src.healer.file_healer import FileHealer
+    from src.healer.rules import RuleDispatcher
+    from src.healer.sharding import Shard, ShardError, SHARD_MODES, write_partial, load_partials, merge_partials, tree_fingerprint
     from src.rag.knowledge_base import KnowledgeBase
     from src.github.integration import GitHubIntegration
     from src.utils.logger import setup_logger
+    from src.utils.history import HealingHistory
+    from src.utils.locking import DirectoryLocks
 except ImportError as e:
     print(f"❌ Import error: {e}")
     print("📁 Checking if all required files exist...")
@@ -30,8 +35,12 @@ except ImportError as e:
     required_files = [
         'src/healer/project_analyzer.py',
         'src/healer/file_healer.py', 
+        'src/healer/sharding.py',
         'src/rag/knowledge_base.py',
-        'src/utils/logger.py'
+        'src/rag/retriever.py',
+        'src/utils/logger.py',
+        'src/utils/history.py',
+        'src/utils/locking.py'
     ]
     for file_path in required_files:
         if not os.path.exists(file_path):
@@ -42,29 +51,114 @@ except ImportError as e:
 logger = setup_logger()
 
 class AutoHealingPipeline:
-    def __init__(self, repo_path: str, github_token: str = None):
+    def __init__(self, repo_path: str, github_token: str = None, rule_plugins: bool = True,
+                 history_db: str = None, lock_timeout: float = 60.0, rag_index: str = None,
+                 rag_budget_ms: float = 5.0):
         self.repo_path = Path(repo_path)
         self.github_token = github_token
-        self.knowledge_base = KnowledgeBase()
-        self.analyzer = ProjectAnalyzer(self.knowledge_base)
-        self.healer = FileHealer(self.knowledge_base)
+        self.knowledge_base = KnowledgeBase(budget_ms=rag_budget_ms)
+        self.history = HealingHistory(history_db) if history_db else None
+        self.rules = RuleDispatcher.default(self.knowledge_base, plugins=rule_plugins)
+        self.analyzer = ProjectAnalyzer(self.knowledge_base, self.rules, self.history)
+        self.rag_index = Path(rag_index) if rag_index else None
+        # The pipeline's own files are never analyzed or committed
+        self.analyzer.exclude(self.rag_index, *(self.history.files() if self.history else []))
+        self.locks = DirectoryLocks(self.repo_path, timeout=lock_timeout)
+        self.healer = FileHealer(self.knowledge_base, self.locks)
         self.github = GitHubIntegration(github_token) if github_token else None
     
-    def run(self, auto_commit: bool = False, dry_run: bool = False) -> dict:
-        """Run the complete auto-healing pipeline"""
+    def run(self, auto_commit: bool = False, dry_run: bool = False, shard=None,
+            shard_dir: str = None, run_id: str = None) -> dict:
+        """Run the complete auto-healing pipeline
+        
+        With a ``shard``, only that shard's part of the tree is analyzed and
+        the result is written to ``shard_dir`` for ``merge_shards``, tagged
+        with the git HEAD and ``run_id``.
+        """
         logger.info("🚀 Starting Auto-Healing Pipeline")
+        started_at = time.time()
+        timings = {}
         
         if dry_run:
             logger.info("🔍 DRY RUN MODE - No changes will be made")
         
+        # Partials other shards are writing are never analyzed or committed
+        self.analyzer.exclude(shard_dir)
+        
+        # Shards never build the index: N of them would each walk the whole tree
+        error = self._attach_index(build_missing=shard is None, save=not dry_run)
+        if shard and not error:
+            try:
+                fingerprint = tree_fingerprint(self.repo_path, run_id)
+            except ShardError as e:
+                error = str(e)
+        if error:
+            logger.error(error)
+            return {"status": "error", "errors": [error]}
+        
         # Step 1: Analyze project
-        logger.info("🔍 Analyzing project structure...")
-        issues = self.analyzer.analyze_project(self.repo_path)
+        logger.info(f"🔍 Analyzing project structure{f' (shard {shard})' if shard else ''}...")
+        start = time.perf_counter()
+        issues = self.analyzer.analyze_project(self.repo_path, shard)
+        timings['analyze'] = time.perf_counter() - start
+        
+        if shard:
+            partial = write_partial(shard, Path(shard_dir), self.repo_path, issues, fingerprint)
+            self._print_issues(issues)
+            self.print_rule_stats()
+            self._record(issues, {}, timings, "shard", started_at)
+            return {"status": "shard", "issues": issues, "partial": str(partial)}
         
         if not issues:
             logger.info("✅ No issues found!")
+            self._record(issues, {}, timings, "healthy", started_at)
             return {"status": "healthy", "issues": []}
         
+        self._print_issues(issues)
+        self.print_rule_stats()
+        
+        return self._heal(issues, auto_commit, dry_run, timings, started_at)
+    
+    def merge_shards(self, shard_dir: str, auto_commit: bool = False, dry_run: bool = False,
+                     run_id: str = None) -> dict:
+        """Merge shard partials, check for collisions, then heal once
+        
+        Every partial must come from this checkout's HEAD and ``run_id``.
+        """
+        logger.info(f"🧩 Merging shard results from {shard_dir}")
+        started_at = time.time()
+        timings = {}
+        self.analyzer.exclude(shard_dir)
+        
+        start = time.perf_counter()
+        try:
+            partials = load_partials(Path(shard_dir), tree_fingerprint(self.repo_path, run_id))
+        except ShardError as e:
+            logger.error(str(e))
+            return {"status": "error", "errors": [str(e)]}
+        issues, collisions = merge_partials(partials, self.repo_path)
+        timings['analyze'] = time.perf_counter() - start
+        
+        if collisions:
+            print(f"\n❌ Found {len(collisions)} rename collisions, nothing was healed:")
+            for collision in collisions:
+                print(f"   {collision['to']}: {collision['reason']}")
+                for step in collision['renames']:
+                    print(f"     - {step['from']} (shard {step['shard']})")
+            errors = [f"Rename collision on {c['to']}: {c['reason']}" for c in collisions]
+            self._record(issues, {'errors': errors}, timings, "collisions", started_at)
+            return {"status": "collisions", "collisions": collisions, "errors": errors}
+        
+        if not issues:
+            logger.info("✅ No issues found!")
+            self._record(issues, {}, timings, "healthy", started_at)
+            return {"status": "healthy", "issues": []}
+        
+        self._print_issues(issues)
+        
+        return self._heal(issues, auto_commit, dry_run, timings, started_at)
+    
+    def _print_issues(self, issues: dict):
         print(f"\n📋 Found {sum(len(v) for v in issues.values())} issues:")
         for issue_type, items in issues.items():
             if items:
@@ -72,26 +166,39 @@ class AutoHealingPipeline:
                 for item in items:
                     if 'original_name' in item:
                         print(f"     - {item['original_name']} → {item['suggestion']}")
+                    elif 'rule' in item:
+                        print(f"     - {item['file']} [{item['rule']}] {item['reason']}")
                     else:
                         print(f"     - {item.get('file', 'Unknown')}")
-        
+    
+    def _heal(self, issues: dict, auto_commit: bool, dry_run: bool, timings: dict,
+              started_at: float) -> dict:
+        """Apply fixes and optionally commit them"""
         if dry_run:
             print("\n💡 This is a dry run. Run without --dry-run to actually fix these issues.")
+            self._record(issues, {}, timings, "dry_run", started_at)
             return {"status": "dry_run", "issues": issues}
         
         # Step 2: Apply healing
         logger.info("🛠️ Applying fixes...")
+        start = time.perf_counter()
         healing_report = self.healer.heal_project(self.repo_path, issues)
+        timings['heal'] = time.perf_counter() - start
         
         # Step 3: Commit changes if requested
         if auto_commit and self.github and healing_report.get('renamed_files'):
             logger.info("📝 Committing changes to GitHub...")
+            start = time.perf_counter()
             commit_result = self.github.commit_changes(
                 self.repo_path,
-                "Auto-heal: Fix file naming and project structure issues"
+                "Auto-heal: Fix file naming and project structure issues",
+                exclude=self.analyzer.excluded_paths(self.repo_path)
             )
+            timings['commit'] = time.perf_counter() - start
             healing_report['commit'] = commit_result
         
+        self._record(issues, healing_report, timings, "healed", started_at)
+        
         logger.info("🎉 Auto-healing completed!")
         
         # Print summary
@@ -103,6 +210,79 @@ class AutoHealingPipeline:
         print(f"Errors: {len(healing_report.get('errors', []))}")
         
         return healing_report
+    
+    def build_index(self):
+        """Build the name index from the repo's conventional names and past renames"""
+        # Serialized with any run loading it, so nobody reads a half-written index
+        with self.locks.lock(self.rag_index):
+            self._save_index()
+    
+    def _save_index(self):
+        self._build_index().save(self.rag_index)
+    
+    def _build_index(self):
+        from src.rag.retriever import NameIndex
+        
+        names = self.analyzer.conventional_names(self.repo_path)
+        if self.history:
+            names += self.history.renamed_names(self.repo_path)
+        return NameIndex.build(names)
+    
+    def _attach_index(self, build_missing: bool, save: bool = True):
+        """Load the name index into the knowledge base; returns an error message
+        
+        With ``save=False`` (dry runs) a missing index is built in memory only.
+        """
+        if not self.rag_index:
+            return None
+        from src.rag.retriever import NameIndex
+        
+        with self.locks.lock(self.rag_index):
+            if not NameIndex.exists(self.rag_index):
+                if not build_missing:
+                    return (f"Name index {self.rag_index} not found or outdated; build it once "
+                            f"with --build-rag-index before running shards")
+                if not save:
+                    self.knowledge_base.index = self._build_index()
+                    return None
+                self._save_index()
+            self.knowledge_base.index = NameIndex.load(self.rag_index)
+        return None
+    
+    def _record(self, issues: dict, report: dict, timings: dict, status: str, started_at: float):
+        """Persist the run to the history database, if one is configured"""
+        if not self.history:
+            return
+        timings['total'] = time.time() - started_at
+        try:
+            self.history.record_run(self.repo_path, issues, report, timings, status, started_at)
+        except Exception as e:
+            logger.error(f"Error recording run history: {str(e)}")
+    
+    def print_rule_stats(self):
+        """Print per-rule timing and hit counts"""
+        print("\n⏱️  Rule stats:")
+        for row in self.rules.report():
+            print(f"   {row['rule']}: {row['hits']} hits / {row['calls']} files, "
+                  f"{row['seconds'] * 1000:.2f} ms")
+
+def query_history(history: HealingHistory, args):
+    """Answer the history CLI queries"""
+    if args.accept:
+        history.accept(Path(args.path), args.accept)
+        print(f"✅ Accepted exception: {args.accept}")
+    
+    if args.most_healed:
+        print(f"\n🩹 Most-healed paths in {Path(args.path).resolve()}:")
+        for row in history.most_healed_paths(Path(args.path), args.most_healed):
+            print(f"   {row['times']:>4}x  {row['path']}")
+    
+    if args.slowest_runs:
+        print(f"\n🐢 Slowest runs:")
+        for row in history.slowest_runs(args.slowest_runs):
+            started = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(row['started_at']))
+            print(f"   #{row['run_id']} {started} {row['status']:<8} "
+                  f"{row['total_seconds']:.2f}s  {row['repo_path']}")
 
 def main():
     parser = argparse.ArgumentParser(description='Auto-Healing Pipeline')
@@ -110,11 +290,53 @@ def main():
     parser.add_argument('--auto-commit', action='store_true', help='Auto commit changes')
     parser.add_argument('--dry-run', action='store_true', help='Show what would be fixed without making changes')
     parser.add_argument('--github-token', help='GitHub token')
+    parser.add_argument('--no-rule-plugins', action='store_true', help='Only run built-in rules, skip entry point plugins')
+    parser.add_argument('--lock-timeout', type=float, default=60.0, help='Seconds to wait for a directory lock held by another run')
+    parser.add_argument('--rag-index', metavar='DIR', help='Name index for convention-aware suggestions (built if missing, except in shards)')
+    parser.add_argument('--build-rag-index', action='store_true', help='Rebuild the name index from the repo and history and exit')
+    parser.add_argument('--rag-budget-ms', type=float, default=5.0, help='Latency budget per name index lookup')
+    parser.add_argument('--shard', metavar='i/N', help='Only analyze shard i of N (0-based) and write a partial result')
+    parser.add_argument('--shard-by', choices=SHARD_MODES, default='top', help='Partition by top-level directory or by full path')
+    parser.add_argument('--shard-dir', help='Directory for shard partial results')
+    parser.add_argument('--merge-shards', metavar='DIR', help='Merge shard partials from DIR, check collisions, then heal')
+    parser.add_argument('--shard-run-id', help='Token shared by the shards and merge of one run (required outside git)')
+    parser.add_argument('--history-db', help='SQLite database to record healing runs in')
+    parser.add_argument('--accept', metavar='PATH', help='Record a repo-relative path as an accepted exception and exit')
+    parser.add_argument('--most-healed', type=int, metavar='N', help='Show the N most-healed paths and exit')
+    parser.add_argument('--slowest-runs', type=int, metavar='N', help='Show the N slowest runs and exit')
     
     args = parser.parse_args()
     
-    pipeline = AutoHealingPipeline(args.path, args.github_token)
-    result = pipeline.run(auto_commit=args.auto_commit, dry_run=args.dry_run)
+    if args.accept or args.most_healed or args.slowest_runs:
+        if not args.history_db:
+            parser.error('--accept, --most-healed and --slowest-runs require --history-db')
+        query_history(HealingHistory(args.history_db), args)
+        return
+    
+    shard = None
+    if args.shard:
+        if not args.shard_dir:
+            parser.error('--shard requires --shard-dir')
+        try:
+            shard = Shard.parse(args.shard, args.shard_by)
+        except ShardError as e:
+            parser.error(str(e))
+    
+    pipeline = AutoHealingPipeline(args.path, args.github_token, rule_plugins=not args.no_rule_plugins,
+                                   history_db=args.history_db, lock_timeout=args.lock_timeout,
+                                   rag_index=args.rag_index, rag_budget_ms=args.rag_budget_ms)
+    if args.build_rag_index:
+        if not args.rag_index:
+            parser.error('--build-rag-index requires --rag-index')
+        pipeline.build_index()
+        return
+    
+    if args.merge_shards:
+        result = pipeline.merge_shards(args.merge_shards, auto_commit=args.auto_commit, dry_run=args.dry_run,
+                                       run_id=args.shard_run_id)
+    else:
+        result = pipeline.run(auto_commit=args.auto_commit, dry_run=args.dry_run,
+                              shard=shard, shard_dir=args.shard_dir, run_id=args.shard_run_id)
     
     if result.get('errors'):
         print(f"\n❌ Errors encountered: {result['errors']}")
@@ -9,12 +9,17 @@ class GitHubIntegration:
     def __init__(self, github_token: str):
         self.github_token = github_token
     
-    def commit_changes(self, repo_path: Path, commit_message: str) -> dict:
-        """Commit and push changes to GitHub"""
+    def commit_changes(self, repo_path: Path, commit_message: str, exclude=()) -> dict:
+        """Commit and push changes to GitHub
+        
+        ``exclude`` lists repo-relative paths (the pipeline's own state,
+        e.g. its history database) that are never staged.
+        """
+        pathspec = ['--', '.'] + [f':(exclude){path}' for path in exclude]
         try:
             # Check if there are changes
             result = subprocess.run(
-                ['git', 'status', '--porcelain'],
+                ['git', 'status', '--porcelain'] + pathspec,
                 cwd=repo_path,
                 capture_output=True,
                 text=True
@@ -24,7 +29,7 @@ class GitHubIntegration:
                 return {'status': 'no_changes'}
             
             # Add all changes
-            subprocess.run(['git', 'add', '.'], cwd=repo_path, check=True)
+            subprocess.run(['git', 'add'] + pathspec, cwd=repo_path, check=True)
             
             # Commit changes
             subprocess.run(
@@ -1,5 +1,6 @@
 import os
 import shutil
+from contextlib import nullcontext
 from pathlib import Path
 from typing import Dict, List, Any
 from ..utils.logger import setup_logger
@@ -7,8 +8,13 @@ from ..utils.logger import setup_logger
 logger = setup_logger()
 
 class FileHealer:
-    def __init__(self, knowledge_base):
+    def __init__(self, knowledge_base, locks=None):
         self.kb = knowledge_base
+        self.locks = locks
+    
+    def _lock(self, directory: Path):
+        """Directory lock shared with other pipelines on this checkout"""
+        return self.locks.lock(directory) if self.locks else nullcontext()
     
     def heal_project(self, project_path: Path, issues: Dict[str, List]) -> Dict[str, Any]:
         """Apply fixes to the project - SIMPLIFIED"""
@@ -37,19 +43,30 @@ class FileHealer:
             if old_path.name.lower() == new_name.lower():
                 return
             
-            # Copy content to new file
-            if old_path.exists():
+            # Copy content to new file; another pipeline may have already
+            # healed it, so only check existence once we hold the lock
+            with self._lock(old_path.parent):
+                if not old_path.exists():
+                    return
+                
+                # Never overwrite a different file already at the target
+                if new_path.exists() and not os.path.samefile(old_path, new_path):
+                    error_msg = f"Error fixing {old_path}: {new_name} already exists"
+                    report['errors'].append(error_msg)
+                    logger.error(error_msg)
+                    return
+                
                 shutil.copy2(old_path, new_path)
                 
                 # Delete old file only if different from new file
                 if old_path.resolve() != new_path.resolve():
                     old_path.unlink()
-                
-                report['renamed_files'].append({
-                    'from': str(old_path),
-                    'to': str(new_path)
-                })
-                logger.info(f"✅ Fixed: {old_path.name} → {new_name}")
+            
+            report['renamed_files'].append({
+                'from': str(old_path),
+                'to': str(new_path)
+            })
+            logger.info(f"✅ Fixed: {old_path.name} → {new_name}")
                 
         except Exception as e:
             error_msg = f"Error fixing {old_path}: {str(e)}"
@@ -61,14 +78,17 @@ class FileHealer:
         try:
             file_path = project_path / filename
             
-            if not file_path.exists():
-                file_path.parent.mkdir(parents=True, exist_ok=True)
+            file_path.parent.mkdir(parents=True, exist_ok=True)
+            
+            with self._lock(file_path.parent):
+                if file_path.exists():
+                    return
                 
                 template = self.kb.get_file_template(filename)
                 file_path.write_text(template)
-                
-                report['created_files'].append(str(file_path))
-                logger.info(f"✅ Created: {filename}")
+            
+            report['created_files'].append(str(file_path))
+            logger.info(f"✅ Created: {filename}")
                 
         except Exception as e:
             error_msg = f"Error creating {filename}: {str(e)}"
@@ -0,0 +1,134 @@
+import os
+import re
+from pathlib import Path
+from typing import Dict, List
+from ..utils.logger import setup_logger
+
+logger = setup_logger()
+
+class ProjectAnalyzer:
+    def __init__(self, knowledge_base, rules=None, history=None):
+        self.kb = knowledge_base
+        self.rules = rules
+        self.history = history
+        self.accepted = set()
+        self.excluded = set()
+
+    def exclude(self, *paths):
+        """Never analyze these files or directories (the pipeline's own state)"""
+        self.excluded.update(Path(p).resolve() for p in paths if p)
+
+    def analyze_project(self, project_path: Path, shard=None) -> Dict[str, List]:
+        """Analyze project structure and identify issues - SIMPLIFIED
+        
+        With a ``shard``, only the files that shard owns are analyzed.
+        """
+        issues = {
+            'invalid_filenames': [],
+            'missing_files': [],
+            'rule_violations': [],
+        }
+        
+        # Known exceptions are loaded once; per-file checks are set lookups
+        if self.history:
+            self.accepted = self.history.accepted_paths(project_path)
+        
+        # Analyze all files, looking up suggestions in one batch
+        file_paths = list(self._iter_files(project_path, shard))
+        suggestions = self.kb.generate_suggestions([p.name for p in file_paths])
+        for file_path, suggestion in zip(file_paths, suggestions):
+            # Never suggest renaming onto an existing sibling
+            if suggestion != file_path.name and (file_path.parent / suggestion).exists():
+                suggestion = self.kb.generate_suggestion(file_path.name)
+            self._analyze_file(file_path, issues, project_path, suggestion)
+        
+        return {k: v for k, v in issues.items() if v}
+    
+    def _iter_files(self, project_path: Path, shard=None):
+        excluded = self.excluded_paths(project_path)
+        for root, dirs, files in os.walk(project_path):
+            # Skip node_modules and git directories
+            if 'node_modules' in root or '.git' in root:
+                continue
+
+            if shard and Path(root) == Path(project_path):
+                # Prune whole subtrees owned by other shards
+                dirs[:] = [d for d in dirs if shard.owns_top_dir(d)]
+
+            rel_root = Path(root).relative_to(project_path)
+            if excluded:
+                dirs[:] = [d for d in dirs if (rel_root / d).as_posix() not in excluded]
+
+            for file in files:
+                rel_path = (rel_root / file).as_posix()
+                if rel_path in excluded:
+                    continue
+                if shard and not shard.owns(rel_path):
+                    continue
+                yield Path(root) / file
+
+    def excluded_paths(self, project_path: Path) -> List[str]:
+        """Excluded paths inside ``project_path``, repo-relative"""
+        base = Path(project_path).resolve()
+        relative = []
+        for path in self.excluded:
+            try:
+                relative.append(path.relative_to(base).as_posix())
+            except ValueError:
+                continue
+        return relative
+    
+    def conventional_names(self, project_path: Path) -> List[str]:
+        """Filenames in the project that already follow the naming rules"""
+        return [p.name for p in self._iter_files(project_path)
+                if self.kb.generate_suggestion(p.name) == p.name]
+    
+    def _check_naming(self, file_path: Path, rel_path: str, issues: Dict, suggestion: str = None):
+        """Naming fix and policy rules for one file"""
+        filename = file_path.name
+        
+        # Run policy rules that apply to this file
+        violations = self.rules.check(rel_path) if self.rules else []
+        issues['rule_violations'].extend(violations)
+        
+        # Files that shouldn't exist at all (e.g. .DS_Store) keep their name
+        if violations and self.rules.blocks_rename(violations):
+            return
+        
+        # Get suggested name
+        if suggestion is None:
+            suggestion = self.kb.generate_suggestion(filename)
+        
+        # If suggestion is different, add to issues
+        if suggestion != filename:
+            issues['invalid_filenames'].append({
+                'path': str(file_path),
+                'original_name': filename,
+                'suggestion': suggestion,
+                'reason': f'Should be {suggestion}'
+            })
+    
+    def _analyze_file(self, file_path: Path, issues: Dict, project_path: Path, suggestion: str = None):
+        """Analyze individual file"""
+        filename = file_path.name
+        
+        # Skip certain files
+        if filename in ['package-lock.json', 'yarn.lock']:
+            return
+        
+        # Accepted exceptions skip naming and policy checks, but still count
+        # as root files for the required-files check below
+        rel_path = file_path.relative_to(project_path).as_posix()
+        if rel_path not in self.accepted:
+            self._check_naming(file_path, rel_path, issues, suggestion)
+        
+        # Check for required Netlify files in root
+        if file_path.parent == project_path:
+            required_files = self.kb.rules.get('required_files', {}).get('netlify', [])
+            for req_file in required_files:
+                req_path = project_path / req_file
+                if not req_path.exists() and req_file not in [i['file'] for i in issues.get('missing_files', [])]:
+                    issues['missing_files'].append({
+                        'file': req_file,
+                        'reason': f'Required for Netlify deployment'
+                    })
\ No newline at end of file
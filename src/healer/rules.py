@@ -0,0 +1,203 @@
+import time
+from importlib.metadata import entry_points
+from pathlib import PurePosixPath
+from typing import Dict, Iterable, List, Any
+from ..utils.logger import setup_logger
+
+logger = setup_logger()
+
+# Entry point group that third-party packages register their rules under, e.g.
+#   [project.entry-points."auto_healing_pipeline.rules"]
+#   max-depth = "my_org.rules:MaxDepthRule"
+ENTRY_POINT_GROUP = "auto_healing_pipeline.rules"
+
+
+class Rule:
+    """Base class for analyzer rules.
+
+    Subclasses set ``name`` and narrow the files they care about with
+    ``extensions`` (e.g. ``'.png'``, matched case-insensitively),
+    ``filenames`` and ``paths`` (repo-relative POSIX directory prefixes).
+    An empty tuple means "any". ``check`` returns a list of violation dicts,
+    empty when the file is fine.
+
+    Rules flagging files that shouldn't exist at all set ``blocks_rename``:
+    those files get no naming fix, since renaming ``.DS_Store`` to
+    ``.ds-store`` would only hide it from the rule.
+    """
+    name = "rule"
+    extensions: tuple = ()
+    filenames: tuple = ()
+    paths: tuple = ()
+    blocks_rename = False
+
+    def __init__(self, knowledge_base=None):
+        self.kb = knowledge_base
+
+    def check(self, rel_path: str) -> List[Dict[str, Any]]:
+        raise NotImplementedError
+
+    def violation(self, rel_path: str, reason: str, **extra) -> Dict[str, Any]:
+        issue = {'file': rel_path, 'rule': self.name, 'reason': reason}
+        issue.update(extra)
+        return issue
+
+
+class MaxPathLengthRule(Rule):
+    """Repo-relative paths must fit in ``file_naming.max_path_length``"""
+    name = "max-path-length"
+
+    def check(self, rel_path: str) -> List[Dict[str, Any]]:
+        limit = self.kb.rules.get('file_naming', {}).get('max_path_length', 255)
+        if len(rel_path) > limit:
+            return [self.violation(rel_path, f'Path is {len(rel_path)} chars (max {limit})')]
+        return []
+
+
+class MaxFilenameLengthRule(Rule):
+    """Filenames must fit in ``file_naming.max_length``"""
+    name = "max-filename-length"
+
+    def check(self, rel_path: str) -> List[Dict[str, Any]]:
+        limit = self.kb.rules.get('file_naming', {}).get('max_length', 50)
+        filename = PurePosixPath(rel_path).name
+        if len(filename) > limit:
+            return [self.violation(rel_path, f'Filename is {len(filename)} chars (max {limit})')]
+        return []
+
+
+class NoDSStoreRule(Rule):
+    """macOS Finder metadata should never be committed"""
+    name = "no-ds-store"
+    filenames = ('.DS_Store',)
+    blocks_rename = True
+
+    def check(self, rel_path: str) -> List[Dict[str, Any]]:
+        return [self.violation(rel_path, '.DS_Store files should not be committed')]
+
+
+BUILTIN_RULES = [
+    MaxPathLengthRule,
+    MaxFilenameLengthRule,
+    NoDSStoreRule,
+]
+
+
+def load_plugin_rules(knowledge_base=None) -> List[Rule]:
+    """Instantiate every rule registered under ENTRY_POINT_GROUP"""
+    eps = entry_points()
+    if hasattr(eps, 'select'):
+        eps = eps.select(group=ENTRY_POINT_GROUP)
+    else:  # Python 3.9 returns a dict of groups
+        eps = eps.get(ENTRY_POINT_GROUP, [])
+
+    rules = []
+    for ep in eps:
+        try:
+            rule = ep.load()
+            if isinstance(rule, type):
+                rule = rule(knowledge_base)
+            if rule.name == Rule.name:
+                rule.name = ep.name
+            rules.append(rule)
+            logger.info(f"🔌 Loaded rule plugin: {ep.name}")
+        except Exception as e:
+            logger.error(f"Error loading rule plugin {ep.name}: {str(e)}")
+    return rules
+
+
+class RuleDispatcher:
+    """Runs each file through only the rules that apply to it.
+
+    Rules are indexed by extension and filename up front, so a file only
+    pays for the rules whose declared scope can match it. Path prefixes are
+    not indexed: each remaining candidate checks its prefixes with one
+    ``str.startswith``, which is linear in the number of prefixes. Prefixes
+    match whole path components, so ``src`` never matches ``srcfoo/``.
+    Rule names must be unique since stats are keyed by name.
+    """
+
+    def __init__(self, rules: Iterable[Rule]):
+        self.rules = list(rules)
+        names = [rule.name for rule in self.rules]
+        duplicates = sorted({name for name in names if names.count(name) > 1})
+        if duplicates:
+            raise ValueError(f"Duplicate rule names: {', '.join(duplicates)}")
+        self._by_extension: Dict[str, List[Rule]] = {}
+        self._by_filename: Dict[str, List[Rule]] = {}
+        self._any_file: List[Rule] = []
+        self._cache: Dict[tuple, List[Rule]] = {}
+        self._by_name = {rule.name: rule for rule in self.rules}
+        self._prefixes = {rule.name: tuple(p.rstrip('/') + '/' for p in rule.paths)
+                          for rule in self.rules}
+        self.stats = {rule.name: {'calls': 0, 'hits': 0, 'seconds': 0.0} for rule in self.rules}
+
+        for rule in self.rules:
+            rule.extensions = tuple(ext.lower() for ext in rule.extensions)
+            if rule.filenames:
+                for filename in rule.filenames:
+                    self._by_filename.setdefault(filename, []).append(rule)
+            elif rule.extensions:
+                for ext in rule.extensions:
+                    self._by_extension.setdefault(ext, []).append(rule)
+            else:
+                self._any_file.append(rule)
+
+    @classmethod
+    def default(cls, knowledge_base, plugins: bool = True) -> "RuleDispatcher":
+        """Built-in rules plus any installed plugins"""
+        rules = [rule_cls(knowledge_base) for rule_cls in BUILTIN_RULES]
+        if plugins:
+            names = {rule.name for rule in rules}
+            for rule in load_plugin_rules(knowledge_base):
+                if rule.name in names:
+                    logger.error(f"Skipping rule plugin {rule.name}: a rule with that name is already loaded")
+                    continue
+                names.add(rule.name)
+                rules.append(rule)
+        return cls(rules)
+
+    def rules_for(self, rel_path: str) -> List[Rule]:
+        """Rules whose extension, filename and path scope all match"""
+        path = PurePosixPath(rel_path)
+        key = (path.name, path.suffix.lower())
+        candidates = self._cache.get(key)
+        if candidates is None:
+            candidates = []
+            for rule in self._by_filename.get(path.name, []):
+                if not rule.extensions or key[1] in rule.extensions:
+                    candidates.append(rule)
+            candidates.extend(self._by_extension.get(key[1], []))
+            candidates.extend(self._any_file)
+            self._cache[key] = candidates
+
+        return [rule for rule in candidates
+                if not rule.paths or (rel_path + '/').startswith(self._prefixes[rule.name])]
+
+    def blocks_rename(self, violations: List[Dict[str, Any]]) -> bool:
+        """Whether any of a file's violations rules out a naming fix"""
+        return any(self._by_name[v['rule']].blocks_rename for v in violations
+                   if v.get('rule') in self._by_name)
+
+    def check(self, rel_path: str) -> List[Dict[str, Any]]:
+        """Run all applicable rules, recording per-rule timing and hits"""
+        violations = []
+        for rule in self.rules_for(rel_path):
+            stats = self.stats[rule.name]
+            start = time.perf_counter()
+            try:
+                found = rule.check(rel_path)
+            except Exception as e:
+                found = []
+                logger.error(f"Rule {rule.name} failed on {rel_path}: {str(e)}")
+            stats['seconds'] += time.perf_counter() - start
+            stats['calls'] += 1
+            if found:
+                stats['hits'] += len(found)
+                violations.extend(found)
+        return violations
+
+    def report(self) -> List[Dict[str, Any]]:
+        """Per-rule stats, slowest first"""
+        rows = [{'rule': name, **stats} for name, stats in self.stats.items()]
+        return sorted(rows, key=lambda row: row['seconds'], reverse=True)
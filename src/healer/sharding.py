@@ -0,0 +1,199 @@
+import hashlib
+import json
+import subprocess
+from pathlib import Path
+from typing import Dict, List, Any, Tuple
+from ..utils.logger import setup_logger
+
+logger = setup_logger()
+
+SHARD_MODES = ('top', 'path')
+
+
+class ShardError(Exception):
+    """Raised for invalid shard specs or an incomplete/inconsistent shard set"""
+
+
+class Shard:
+    """One of N deterministic partitions of a project tree.
+
+    Paths are assigned by a stable hash (SHA-1, never Python's salted
+    ``hash``) so every machine agrees on the split. In ``top`` mode the key
+    is the top-level directory, so whole subtrees are pruned from the walk;
+    root-level files are keyed by their own name. In ``path`` mode every
+    file is keyed by its full repo-relative path, which balances better
+    when one directory dominates.
+    """
+
+    def __init__(self, index: int, count: int, mode: str = 'top'):
+        if count < 1 or not 0 <= index < count:
+            raise ShardError(f"Shard index must be in 0..{count - 1}, got {index}")
+        if mode not in SHARD_MODES:
+            raise ShardError(f"Shard mode must be one of {SHARD_MODES}, got {mode}")
+        self.index = index
+        self.count = count
+        self.mode = mode
+
+    @classmethod
+    def parse(cls, spec: str, mode: str = 'top') -> "Shard":
+        """Parse ``i/N`` (0-based)"""
+        try:
+            index, count = (int(part) for part in spec.split('/'))
+        except ValueError:
+            raise ShardError(f"Shard must look like i/N, got {spec!r}")
+        return cls(index, count, mode)
+
+    def __str__(self):
+        return f"{self.index}/{self.count}"
+
+    def _bucket(self, key: str) -> int:
+        digest = hashlib.sha1(key.encode()).digest()
+        return int.from_bytes(digest[:8], 'big') % self.count
+
+    def owns(self, rel_path: str) -> bool:
+        """Whether this shard analyzes the repo-relative file path"""
+        if self.mode == 'top':
+            rel_path = rel_path.split('/', 1)[0]
+        return self._bucket(rel_path) == self.index
+
+    def owns_top_dir(self, name: str) -> bool:
+        """Whether the walk should descend into a top-level directory"""
+        return self.mode != 'top' or self._bucket(name) == self.index
+
+    def partial_path(self, shard_dir: Path) -> Path:
+        return Path(shard_dir) / f"shard-{self.index}-of-{self.count}.json"
+
+
+def tree_fingerprint(project_path: Path, run_id: str = None) -> Dict[str, Any]:
+    """Identify the tree a shard analyzed: git HEAD plus an optional run id
+
+    Without a git checkout (or without git at all) a ``run_id`` is
+    required, since nothing else tells a fresh partial from one left over
+    by an earlier run.
+    """
+    try:
+        result = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=project_path,
+                                capture_output=True, text=True)
+        head = result.stdout.strip() if result.returncode == 0 else None
+    except FileNotFoundError:
+        head = None
+    if head is None and run_id is None:
+        raise ShardError(f"{project_path} is not a git checkout; pass a run id to tie shards together")
+    return {'head': head, 'run_id': run_id}
+
+
+def write_partial(shard: Shard, shard_dir: Path, project_path: Path, issues: Dict[str, List],
+                  fingerprint: Dict[str, Any]) -> Path:
+    """Write this shard's issues and rename plan with repo-relative paths"""
+    project_path = Path(project_path)
+    relative = {}
+    for issue_type, items in issues.items():
+        relative[issue_type] = []
+        for item in items:
+            item = dict(item)
+            if 'path' in item:
+                item['path'] = Path(item['path']).relative_to(project_path).as_posix()
+            relative[issue_type].append(item)
+
+    plan = [{'from': item['path'],
+             'to': (Path(item['path']).parent / item['suggestion']).as_posix()}
+            for item in relative.get('invalid_filenames', [])]
+
+    path = shard.partial_path(shard_dir)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({
+        'shard': str(shard),
+        'index': shard.index,
+        'count': shard.count,
+        'mode': shard.mode,
+        'fingerprint': fingerprint,
+        'issues': relative,
+        'plan': plan,
+    }, indent=2))
+    logger.info(f"🧩 Wrote shard {shard} ({len(plan)} renames) to {path}")
+    return path
+
+
+def load_partials(shard_dir: Path, fingerprint: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Load a complete set of shard partials taken from the tree ``fingerprint``"""
+    partials = [json.loads(p.read_text()) for p in sorted(Path(shard_dir).glob('shard-*-of-*.json'))]
+    if not partials:
+        raise ShardError(f"No shard partials found in {shard_dir}")
+
+    stale = [p['shard'] for p in partials if p.get('fingerprint') != fingerprint]
+    if stale:
+        raise ShardError(f"Shard partials {', '.join(stale)} were taken from a different tree or run "
+                         f"(expected {fingerprint})")
+
+    layouts = {(p['count'], p['mode']) for p in partials}
+    if len(layouts) > 1:
+        raise ShardError(f"Shard partials disagree on count/mode: {sorted(layouts)}")
+    count = partials[0]['count']
+    missing = set(range(count)) - {p['index'] for p in partials}
+    if missing:
+        raise ShardError(f"Missing shard partials: {', '.join(f'{i}/{count}' for i in sorted(missing))}")
+    return partials
+
+
+def merge_partials(partials: List[Dict[str, Any]], project_path: Path) -> Tuple[Dict[str, List], List[Dict]]:
+    """Merge shard issues and find renames that would collide.
+
+    A collision is two renames onto the same target (compared
+    case-insensitively, as on macOS checkouts), a rename onto a file that
+    exists and isn't renamed away in the same plan, or a cycle of renames.
+    Renames are ordered so a file is moved away before another takes its
+    name. Issue paths are re-anchored to ``project_path``.
+    """
+    project_path = Path(project_path)
+    issues: Dict[str, List] = {}
+    seen_missing = set()
+    plan = []
+    for partial in partials:
+        plan.extend(dict(step, shard=partial['shard']) for step in partial['plan'])
+        for issue_type, items in partial['issues'].items():
+            for item in items:
+                if issue_type == 'missing_files':
+                    # Several shards may see the root and report the same file
+                    if item['file'] in seen_missing:
+                        continue
+                    seen_missing.add(item['file'])
+                item = dict(item)
+                if 'path' in item:
+                    item['path'] = str(project_path / item['path'])
+                issues.setdefault(issue_type, []).append(item)
+
+    # Case-only renames are skipped by the healer, so they neither free nor take a name
+    plan = [step for step in plan if step['from'].lower() != step['to'].lower()]
+    by_source = {step['from'].lower(): step for step in plan}
+    by_target: Dict[str, List[Dict]] = {}
+    for step in plan:
+        by_target.setdefault(step['to'].lower(), []).append(step)
+
+    collisions = []
+    for target, steps in by_target.items():
+        if len(steps) > 1:
+            collisions.append({'to': steps[0]['to'], 'renames': steps,
+                               'reason': 'Multiple files renamed to the same path'})
+        elif target not in by_source and (project_path / steps[0]['to']).exists():
+            collisions.append({'to': steps[0]['to'], 'renames': steps,
+                               'reason': 'Target already exists'})
+
+    # A rename waits for the rename that moves its target out of the way
+    order, done = [], set()
+    pending = list(plan)
+    while pending:
+        ready = [step for step in pending
+                 if step['to'].lower() not in by_source or step['to'].lower() in done]
+        if not ready:
+            collisions.append({'to': pending[0]['to'], 'renames': pending,
+                               'reason': 'Renames form a cycle'})
+            break
+        for step in ready:
+            order.append(step['from'])
+            done.add(step['from'].lower())
+        pending = [step for step in pending if step['from'].lower() not in done]
+
+    position = {str(project_path / rel_path): i for i, rel_path in enumerate(order)}
+    if 'invalid_filenames' in issues:
+        issues['invalid_filenames'].sort(key=lambda item: position.get(item['path'], -1))
+    return issues, collisions
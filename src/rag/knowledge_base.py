@@ -1,11 +1,58 @@
 import json
 import re
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, List
+
+def compact_name(name: str) -> str:
+    """Lowercase stem with separators removed, plus lowercase extension
+    
+    ``HeroBanner.PNG``, ``hero_banner.png`` and ``hero-banner.png`` all
+    compact to ``herobanner.png``.
+    """
+    path = Path(name)
+    return re.sub(r'[^a-z0-9]+', '', path.stem.lower()) + path.suffix.lower()
+
+def borrow_separators(suggestion: str, neighbour: str) -> str:
+    """Split ``suggestion``'s words where the similar ``neighbour`` splits them
+    
+    Word breaks are copied from the part the two names share at the start
+    and at the end, and only where that shared part runs past the break:
+    ``herobanner2.png`` next to ``hero-banner.png`` becomes
+    ``hero-banner2.png``, but ``heroes.png`` is never split as ``hero-es``.
+    Only hyphens are added, so the characters of the name never change.
+    """
+    path = Path(suggestion)
+    words = path.stem.split('-')
+    query = ''.join(words)
+    breaks = {sum(len(w) for w in words[:i]) for i in range(1, len(words))}
+    
+    n_words = Path(neighbour).stem.split('-')
+    name = ''.join(n_words)
+    n_breaks = [sum(len(w) for w in n_words[:i]) for i in range(1, len(n_words))]
+    
+    prefix = 0
+    while prefix < min(len(query), len(name)) and query[prefix] == name[prefix]:
+        prefix += 1
+    suffix = 0
+    while suffix < min(len(query), len(name)) and query[-1 - suffix] == name[-1 - suffix]:
+        suffix += 1
+    
+    shift = len(query) - len(name)
+    for pos in n_breaks:
+        if pos < prefix:
+            breaks.add(pos)
+        if len(query) - suffix < pos + shift < len(query):
+            breaks.add(pos + shift)
+    
+    bounds = [0] + sorted(breaks) + [len(query)]
+    return '-'.join(query[a:b] for a, b in zip(bounds, bounds[1:])) + path.suffix
 
 class KnowledgeBase:
-    def __init__(self):
+    def __init__(self, index=None, min_similarity: float = 0.6, budget_ms: float = 5.0):
         self.rules = self._load_rules()
+        self.index = index
+        self.min_similarity = min_similarity
+        self.budget_ms = budget_ms
     
     def _load_rules(self) -> Dict[str, Any]:
         """Load healing rules from config"""
@@ -14,6 +61,7 @@ class KnowledgeBase:
                 "recommended": "kebab-case",
                 "allowed_chars": "a-z0-9.-",
                 "max_length": 50,
+                "max_path_length": 255,
             },
             "required_files": {
                 "netlify": ["netlify.toml"],
@@ -76,6 +124,31 @@ class KnowledgeBase:
         
         return suggestion
     
+    def generate_suggestions(self, original_names: List[str]) -> List[str]:
+        """Batch suggestions that follow the repo's nearest conventional name
+        
+        The rule-based suggestion for ``HeroBanner2.PNG`` is
+        ``herobanner2.png``. If the nearest indexed name, ``hero-banner.png``,
+        has a cosine similarity of at least ``min_similarity``, its word breaks
+        are borrowed and ``hero-banner2.png`` is suggested instead (see
+        ``borrow_separators``). Retrieval only ever adds separators, so it
+        can't change what a file is called.
+        """
+        suggestions = [self.generate_suggestion(name) for name in original_names]
+        if self.index is None:
+            return suggestions
+        
+        corrections = self.rules.get("file_corrections", {})
+        pending = [i for i, name in enumerate(original_names)
+                   if suggestions[i] != name and name not in corrections]
+        matches = self.index.query([suggestions[i] for i in pending], budget_ms=self.budget_ms)
+        
+        for i, hits in zip(pending, matches):
+            if hits and hits[0][1] >= self.min_similarity:
+                suggestions[i] = borrow_separators(suggestions[i], hits[0][0])
+        
+        return suggestions
+    
     def get_file_template(self, filename: str) -> str:
         """Get template content for missing files"""
         templates = {
@@ -0,0 +1,232 @@
+import json
+import math
+import os
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+
+from .knowledge_base import compact_name
+from ..utils.logger import setup_logger
+
+logger = setup_logger()
+
+
+class NameIndex:
+    """Character n-gram TF-IDF index over conventional filenames.
+
+    Postings are stored term-major (``term_ptr`` / ``doc_ids`` / ``weights``),
+    i.e. an inverted index, as ``.npy`` files that are memory-mapped on load.
+    Only stems are n-grammed; extensions must match exactly and are checked
+    against ``doc_ext`` while scoring, so a shared extension never expands
+    into a third of the corpus. Queries score every candidate with one
+    vectorized pass per batch.
+
+    File names follow the repo's own naming rules (``term-ptr.npy``), so an
+    index kept inside the tree it serves is never "healed" out from under
+    itself. ``FORMAT`` is bumped whenever the layout changes; an index in an
+    older format counts as missing and is rebuilt.
+    """
+    FILES = ('term_ptr', 'doc_ids', 'weights', 'doc_ext')
+    FORMAT = 2
+
+    def __init__(self, names: List[str], vocab: Dict[str, int], extensions: List[str],
+                 idf: np.ndarray, term_ptr: np.ndarray, doc_ids: np.ndarray,
+                 weights: np.ndarray, doc_ext: np.ndarray, n: int = 3):
+        self.names = names
+        self.vocab = vocab
+        self.extensions = {ext: i for i, ext in enumerate(extensions)}
+        self.idf = idf
+        self.doc_ext = doc_ext
+        self.term_ptr = term_ptr
+        self.doc_ids = doc_ids
+        self.weights = weights
+        self.n = n
+        self.stats = {'queries': 0, 'over_budget': 0, 'seconds': 0.0}
+
+    @staticmethod
+    def grams(name: str, n: int = 3) -> Counter:
+        """Character n-grams of the compacted stem"""
+        text = f'^{Path(compact_name(name)).stem}$'
+        return Counter(text[i:i + n] for i in range(max(len(text) - n + 1, 1)))
+
+    @classmethod
+    def build(cls, names: Iterable[str], n: int = 3) -> "NameIndex":
+        names = sorted(set(names))
+        doc_grams = [cls.grams(name, n) for name in names]
+        suffixes = [Path(name).suffix.lower() for name in names]
+        extensions = sorted(set(suffixes))
+        ext_ids = {ext: i for i, ext in enumerate(extensions)}
+        doc_ext = np.array([ext_ids[s] for s in suffixes], dtype=np.int32)
+
+        vocab: Dict[str, int] = {}
+        df = Counter()
+        for grams in doc_grams:
+            df.update(grams.keys())
+        for gram in sorted(df):
+            vocab[gram] = len(vocab)
+
+        n_docs = len(names)
+        idf = np.array([math.log((1 + n_docs) / (1 + df[g])) + 1 for g in vocab], dtype=np.float32)
+
+        # Collect (term, doc, weight) triples with L2-normalized doc vectors
+        terms, docs, weights = [], [], []
+        for doc_id, grams in enumerate(doc_grams):
+            ids = np.array([vocab[g] for g in grams], dtype=np.int64)
+            w = np.array(list(grams.values()), dtype=np.float32) * idf[ids]
+            w /= np.linalg.norm(w) or 1.0
+            terms.append(ids)
+            docs.append(np.full(len(ids), doc_id, dtype=np.int32))
+            weights.append(w)
+
+        terms = np.concatenate(terms) if terms else np.empty(0, dtype=np.int64)
+        docs = np.concatenate(docs) if docs else np.empty(0, dtype=np.int32)
+        weights = np.concatenate(weights) if weights else np.empty(0, dtype=np.float32)
+
+        order = np.argsort(terms, kind='stable')
+        term_ptr = np.zeros(len(vocab) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(terms, minlength=len(vocab)), out=term_ptr[1:])
+        return cls(names, vocab, extensions, idf, term_ptr, docs[order], weights[order], doc_ext, n)
+
+    @staticmethod
+    def filename(name: str) -> str:
+        return name.replace('_', '-') + '.npy'
+
+    @classmethod
+    def exists(cls, directory: Path) -> bool:
+        """``meta.json`` is written last, so it marks a complete index"""
+        try:
+            meta = json.loads((Path(directory) / 'meta.json').read_text())
+        except (FileNotFoundError, ValueError):
+            return False
+        return meta.get('format') == cls.FORMAT
+
+    def save(self, directory: Path):
+        """Write the index so a crash never leaves one that looks complete.
+
+        ``meta.json`` is removed first and written last, and every file is
+        written under a temporary name and ``os.replace``-d into place, so
+        readers that already memory-mapped the old arrays keep valid data.
+        Concurrent writers must still be serialized by the caller.
+        """
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        meta_path = directory / 'meta.json'
+        if meta_path.exists():
+            meta_path.unlink()
+
+        arrays = dict({name: getattr(self, name) for name in self.FILES}, idf=self.idf)
+        for name, array in arrays.items():
+            tmp_path = directory / f'.{self.filename(name)}.tmp'
+            with open(tmp_path, 'wb') as f:
+                np.save(f, array)
+            os.replace(tmp_path, directory / self.filename(name))
+
+        tmp_path = directory / '.meta.json.tmp'
+        tmp_path.write_text(json.dumps({
+            'format': self.FORMAT, 'n': self.n, 'names': self.names, 'vocab': self.vocab,
+            'extensions': list(self.extensions)
+        }))
+        os.replace(tmp_path, meta_path)
+        logger.info(f"📚 Saved name index ({len(self.names)} names) to {directory}")
+
+    @classmethod
+    def load(cls, directory: Path) -> "NameIndex":
+        """Load an index, memory-mapping the postings arrays"""
+        directory = Path(directory)
+        meta = json.loads((directory / 'meta.json').read_text())
+        arrays = {name: np.load(directory / cls.filename(name), mmap_mode='r') for name in cls.FILES}
+        idf = np.load(directory / cls.filename('idf'))
+        return cls(meta['names'], meta['vocab'], meta['extensions'], idf, n=meta['n'], **arrays)
+
+    def query(self, names: List[str], k: int = 3, budget_ms: float = None,
+              batch_size: int = 256) -> List[List[Tuple[str, float]]]:
+        """Top-k ``(name, cosine)`` neighbours for each query.
+
+        Queries run in batches that start at one lookup and double up to
+        ``batch_size``. With ``budget_ms``, the average time per lookup is
+        checked after every batch and querying stops once it is over budget,
+        so at most the first single lookup can overrun. The remaining
+        queries get no results so callers fall back to their own rules.
+        """
+        results: List[List[Tuple[str, float]]] = [[] for _ in names]
+        if not self.names:
+            return results
+
+        start = time.perf_counter()
+        offset, size = 0, 1
+        while offset < len(names):
+            batch = names[offset:offset + size]
+            for i, hits in enumerate(self._query_batch(batch, k)):
+                results[offset + i] = hits
+            offset += len(batch)
+            size = min(size * 2, batch_size)
+
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            if budget_ms is not None and offset < len(names) and elapsed_ms > budget_ms * offset:
+                self.stats['over_budget'] += len(names) - offset
+                logger.warning(f"⏱️ Name index over budget, skipped {len(names) - offset} lookups")
+                break
+
+        self.stats['queries'] += len(names)
+        self.stats['seconds'] += time.perf_counter() - start
+        return results
+
+    def _query_batch(self, names: List[str], k: int) -> List[List[Tuple[str, float]]]:
+        rows, terms, qweights, qext = [], [], [], np.full(len(names), -1, dtype=np.int32)
+        unseen_idf = math.log(1 + len(self.names)) + 1
+        for row, name in enumerate(names):
+            ext = self.extensions.get(Path(name).suffix.lower())
+            grams = self.grams(name, self.n)
+            known = [(self.vocab[g], c) for g, c in grams.items() if g in self.vocab]
+            if ext is None or not known:
+                continue
+            qext[row] = ext
+            ids = np.array([t for t, _ in known], dtype=np.int64)
+            w = np.array([c for _, c in known], dtype=np.float32) * self.idf[ids]
+            # Unseen grams still count towards the query norm, at the max idf
+            unseen = sum(c * c for g, c in grams.items() if g not in self.vocab) * unseen_idf ** 2
+            norm = math.sqrt(float(np.dot(w, w)) + unseen)
+            rows.append(np.full(len(ids), row, dtype=np.int64))
+            terms.append(ids)
+            qweights.append(w / (norm or 1.0))
+
+        hits: List[List[Tuple[str, float]]] = [[] for _ in names]
+        if not terms:
+            return hits
+        rows, terms, qweights = np.concatenate(rows), np.concatenate(terms), np.concatenate(qweights)
+
+        # Expand every query term into its postings list
+        starts = self.term_ptr[terms]
+        lengths = self.term_ptr[terms + 1] - starts
+        owner = np.repeat(np.arange(len(terms)), lengths)
+        within = np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+        postings = starts[owner] + within
+
+        docs = self.doc_ids[postings]
+        rows = rows[owner]
+        same_ext = self.doc_ext[docs] == qext[rows]
+        if not same_ext.any():
+            return hits
+        owner, docs, rows, postings = owner[same_ext], docs[same_ext], rows[same_ext], postings[same_ext]
+
+        n_docs = len(self.names)
+        keys = rows * n_docs + docs
+        contrib = self.weights[postings] * qweights[owner]
+        keys, inverse = np.unique(keys, return_inverse=True)
+        scores = np.bincount(inverse, weights=contrib)
+
+        query_of, doc_of = keys // n_docs, keys % n_docs
+        order = np.lexsort((-scores, query_of))
+        query_of, doc_of, scores = query_of[order], doc_of[order], scores[order]
+        firsts = np.flatnonzero(np.r_[True, query_of[1:] != query_of[:-1]])
+        for first in firsts:
+            row = int(query_of[first])
+            stop = first + k
+            for j in range(first, min(stop, len(query_of))):
+                if query_of[j] != row:
+                    break
+                hits[row].append((self.names[int(doc_of[j])], float(scores[j])))
+        return hits
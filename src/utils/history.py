@@ -0,0 +1,208 @@
+import json
+import sqlite3
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List, Any, Set
+from .logger import setup_logger
+
+logger = setup_logger()
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    repo_path TEXT NOT NULL,
+    started_at REAL NOT NULL,
+    status TEXT NOT NULL,
+    analyze_seconds REAL,
+    heal_seconds REAL,
+    commit_seconds REAL,
+    total_seconds REAL,
+    commit_status TEXT,
+    commit_result TEXT
+);
+CREATE TABLE IF NOT EXISTS issues (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    issue_type TEXT NOT NULL,
+    path TEXT NOT NULL,
+    suggestion TEXT,
+    reason TEXT
+);
+CREATE TABLE IF NOT EXISTS renames (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    from_path TEXT NOT NULL,
+    to_path TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS errors (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    message TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS accepted_exceptions (
+    repo_path TEXT NOT NULL,
+    path TEXT NOT NULL,
+    reason TEXT,
+    added_at REAL NOT NULL,
+    PRIMARY KEY (repo_path, path)
+);
+CREATE INDEX IF NOT EXISTS idx_runs_repo ON runs(repo_path);
+CREATE INDEX IF NOT EXISTS idx_runs_total ON runs(total_seconds);
+CREATE INDEX IF NOT EXISTS idx_issues_run ON issues(run_id);
+CREATE INDEX IF NOT EXISTS idx_issues_path ON issues(path);
+CREATE INDEX IF NOT EXISTS idx_renames_run ON renames(run_id);
+CREATE INDEX IF NOT EXISTS idx_renames_from ON renames(from_path);
+CREATE INDEX IF NOT EXISTS idx_errors_run ON errors(run_id);
+"""
+
+
+class HealingHistory:
+    """Embedded SQLite store of healing runs.
+
+    The database runs in WAL mode so readers never block the writer, and
+    each run is written in one ``BEGIN IMMEDIATE`` transaction with
+    ``executemany`` so concurrent pipelines queue on the write lock (up to
+    ``timeout`` seconds) instead of failing with "database is locked".
+    Paths are stored relative to the healed repo, and every query is scoped
+    to one repo (its resolved path) since a database can be shared.
+    """
+
+    def __init__(self, db_path: str, timeout: float = 30.0):
+        self.db_path = Path(db_path)
+        self.timeout = timeout
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._migrate(conn)
+            conn.executescript(SCHEMA)
+    
+    def files(self) -> List[Path]:
+        """The database and the journal files SQLite keeps beside it"""
+        return [self.db_path] + [self.db_path.with_name(self.db_path.name + suffix)
+                                 for suffix in ('-wal', '-shm', '-journal')]
+
+    @staticmethod
+    def _migrate(conn):
+        """Move aside accepted exceptions recorded before they were per-repo"""
+        columns = [row[1] for row in conn.execute("PRAGMA table_info(accepted_exceptions)")]
+        if columns and 'repo_path' not in columns:
+            conn.execute("ALTER TABLE accepted_exceptions RENAME TO accepted_exceptions_unscoped")
+            logger.warning("⚠️ Accepted exceptions are now per repo; re-run --accept for existing ones")
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(str(self.db_path), timeout=self.timeout, isolation_level=None)
+        try:
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(f"PRAGMA busy_timeout={int(self.timeout * 1000)}")
+            yield conn
+        finally:
+            conn.close()
+
+    @contextmanager
+    def _write(self):
+        """Single write transaction, taking the lock up front"""
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+    def record_run(self, repo_path: Path, issues: Dict[str, List], report: Dict[str, Any],
+                   timings: Dict[str, float], status: str, started_at: float = None) -> int:
+        """Store one pipeline run with its issues, renames and errors"""
+        repo_path = Path(repo_path)
+        commit = report.get('commit')
+
+        issue_rows = []
+        for issue_type, items in issues.items():
+            for item in items:
+                path = item.get('path') or item.get('file', '')
+                issue_rows.append((issue_type, self._relative(repo_path, path),
+                                   item.get('suggestion'), item.get('reason')))
+        rename_rows = [(self._relative(repo_path, r['from']), self._relative(repo_path, r['to']))
+                       for r in report.get('renamed_files', [])]
+        error_rows = [(str(e),) for e in report.get('errors', [])]
+
+        with self._write() as conn:
+            cursor = conn.execute(
+                "INSERT INTO runs (repo_path, started_at, status, analyze_seconds, heal_seconds, "
+                "commit_seconds, total_seconds, commit_status, commit_result) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (self._repo_key(repo_path), started_at or time.time(), status,
+                 timings.get('analyze'), timings.get('heal'), timings.get('commit'),
+                 timings.get('total'), commit.get('status') if commit else None,
+                 json.dumps(commit) if commit else None)
+            )
+            run_id = cursor.lastrowid
+            conn.executemany(
+                "INSERT INTO issues (run_id, issue_type, path, suggestion, reason) VALUES (?, ?, ?, ?, ?)",
+                [(run_id,) + row for row in issue_rows]
+            )
+            conn.executemany(
+                "INSERT INTO renames (run_id, from_path, to_path) VALUES (?, ?, ?)",
+                [(run_id,) + row for row in rename_rows]
+            )
+            conn.executemany(
+                "INSERT INTO errors (run_id, message) VALUES (?, ?)",
+                [(run_id,) + row for row in error_rows]
+            )
+
+        logger.info(f"🗄️  Recorded run #{run_id} in {self.db_path}")
+        return run_id
+
+    def accept(self, repo_path: Path, path: str, reason: str = None):
+        """Mark a repo-relative path as a known, accepted exception in one repo"""
+        with self._write() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO accepted_exceptions (repo_path, path, reason, added_at) "
+                "VALUES (?, ?, ?, ?)",
+                (self._repo_key(repo_path), Path(path).as_posix(), reason, time.time())
+            )
+
+    def accepted_paths(self, repo_path: Path) -> Set[str]:
+        """A repo's accepted exceptions, loaded once so lookups are set membership"""
+        with self._connect() as conn:
+            return {row[0] for row in conn.execute(
+                "SELECT path FROM accepted_exceptions WHERE repo_path = ?", (self._repo_key(repo_path),)
+            )}
+
+    def renamed_names(self, repo_path: Path) -> List[str]:
+        """Filenames that past runs on a repo renamed files to"""
+        with self._connect() as conn:
+            return [Path(row[0]).name for row in conn.execute(
+                "SELECT DISTINCT to_path FROM renames JOIN runs ON runs.id = renames.run_id "
+                "WHERE runs.repo_path = ?", (self._repo_key(repo_path),)
+            )]
+
+    def most_healed_paths(self, repo_path: Path, limit: int = 10) -> List[Dict[str, Any]]:
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT from_path, COUNT(*) AS times FROM renames JOIN runs ON runs.id = renames.run_id "
+                "WHERE runs.repo_path = ? "
+                "GROUP BY from_path ORDER BY times DESC, from_path LIMIT ?",
+                (self._repo_key(repo_path), limit)
+            ).fetchall()
+        return [{'path': path, 'times': times} for path, times in rows]
+
+    def slowest_runs(self, limit: int = 10) -> List[Dict[str, Any]]:
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT id, repo_path, started_at, status, total_seconds FROM runs "
+                "WHERE total_seconds IS NOT NULL ORDER BY total_seconds DESC LIMIT ?", (limit,)
+            ).fetchall()
+        return [{'run_id': run_id, 'repo_path': repo, 'started_at': started,
+                 'status': status, 'total_seconds': total}
+                for run_id, repo, started, status, total in rows]
+
+    @staticmethod
+    def _repo_key(repo_path: Path) -> str:
+        return str(Path(repo_path).resolve())
+
+    @staticmethod
+    def _relative(repo_path: Path, path: str) -> str:
+        try:
+            return Path(path).relative_to(repo_path).as_posix()
+        except ValueError:
+            return Path(path).as_posix()
@@ -0,0 +1,134 @@
+import fcntl
+import hashlib
+import json
+import os
+import socket
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from .logger import setup_logger
+
+logger = setup_logger()
+
+
+class LockTimeout(Exception):
+    """Raised when a directory lock could not be acquired in time"""
+
+
+class DirectoryLocks:
+    """Advisory per-directory locks shared by every pipeline on one checkout.
+
+    Each directory maps to its own lock file, so pipelines healing
+    independent subtrees never wait on each other, while two pipelines
+    renaming files in the same directory are serialized. Locks are
+    ``fcntl.flock`` locks.
+
+    The kernel releases a flock when the last descriptor for it closes, so a
+    crashed owner never leaves a lock behind and locks are never broken. A
+    lock can only outlive its recorded owner if the descriptor was
+    duplicated into a forked child that is still running; that child may
+    still be working in the directory, so it keeps the lock. Such stale
+    locks are detected and named in the ``LockTimeout`` error instead. A PID
+    only identifies a process within one PID namespace on one boot, so
+    owners record the PID namespace inode and boot id too, and an owner
+    from another container sharing the hostname is never reported as dead.
+    """
+
+    def __init__(self, repo_path: Path, lock_dir: Path = None, timeout: float = 60.0,
+                 poll_interval: float = 0.05):
+        self.repo_path = Path(repo_path).resolve()
+        self.lock_dir = Path(lock_dir) if lock_dir else self._default_lock_dir()
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+        self.identity = self._identity()
+        self.lock_dir.mkdir(parents=True, exist_ok=True)
+
+    def _default_lock_dir(self) -> Path:
+        # Inside .git the lock files are never scanned or committed
+        git_dir = self.repo_path / '.git'
+        if git_dir.is_dir():
+            return git_dir / 'healer-locks'
+        digest = hashlib.sha1(str(self.repo_path).encode()).hexdigest()[:16]
+        return Path(tempfile.gettempdir()) / 'auto-healer-locks' / digest
+
+    def lock_path(self, directory: Path) -> Path:
+        directory = Path(directory).resolve()
+        try:
+            key = directory.relative_to(self.repo_path).as_posix()
+        except ValueError:
+            key = str(directory)
+        return self.lock_dir / (hashlib.sha1(key.encode()).hexdigest()[:16] + '.lock')
+
+    @contextmanager
+    def lock(self, directory: Path):
+        """Hold the exclusive lock for ``directory``"""
+        path = self.lock_path(directory)
+        fd = self._acquire(path, directory)
+        try:
+            yield
+        finally:
+            os.ftruncate(fd, 0)
+            fcntl.flock(fd, fcntl.LOCK_UN)
+            os.close(fd)
+
+    def _acquire(self, path: Path, directory: Path) -> int:
+        deadline = time.monotonic() + self.timeout
+        while True:
+            fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                os.close(fd)
+                if time.monotonic() >= deadline:
+                    raise LockTimeout(f"Timed out after {self.timeout}s waiting for lock on {directory}"
+                                      f"{self._describe_owner(path)}")
+                time.sleep(self.poll_interval)
+                continue
+
+            owner = json.dumps(dict(self.identity, pid=os.getpid(), acquired_at=time.time()))
+            os.ftruncate(fd, 0)
+            os.pwrite(fd, owner.encode(), 0)
+            return fd
+
+    def _describe_owner(self, path: Path) -> str:
+        """Who holds ``path``, flagging a lock kept by a dead owner's child"""
+        try:
+            owner = json.loads(path.read_text() or 'null')
+        except (FileNotFoundError, ValueError):
+            return ""
+        if not owner:
+            return ""
+        if self._same_namespace(owner) and not self._pid_alive(owner.get('pid')):
+            logger.warning(f"⚠️ Stale lock {path.name}: owner pid {owner.get('pid')} is dead")
+            return (f" (stale: owner pid {owner.get('pid')} is dead, the lock is held by a "
+                    f"process it forked; stop that process to release it)")
+        return f" (held by pid {owner.get('pid')} on {owner.get('host')})"
+
+    @staticmethod
+    def _identity() -> dict:
+        """Where our PIDs are meaningful: host, boot and PID namespace"""
+        identity = {'host': socket.gethostname(), 'boot_id': None, 'pid_ns': None}
+        try:
+            identity['boot_id'] = Path('/proc/sys/kernel/random/boot_id').read_text().strip()
+            identity['pid_ns'] = os.stat('/proc/self/ns/pid').st_ino
+        except OSError:
+            pass
+        return identity
+
+    def _same_namespace(self, owner: dict) -> bool:
+        if self.identity['boot_id'] is None or self.identity['pid_ns'] is None:
+            return False
+        return all(owner.get(key) == value for key, value in self.identity.items())
+
+    @staticmethod
+    def _pid_alive(pid) -> bool:
+        if not isinstance(pid, int):
+            return True
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            return True
+        return True
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Stress test: N concurrent pipelines healing one checkout
+"""
+import json
+import logging
+import multiprocessing
+import os
+import sys
+import tempfile
+import fcntl
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from src.healer.project_analyzer import ProjectAnalyzer
+from src.healer.file_healer import FileHealer
+from src.rag.knowledge_base import KnowledgeBase
+from src.utils.locking import DirectoryLocks, LockTimeout
+
+PIPELINES = 8
+DIRECTORIES = 6
+FILES_PER_DIRECTORY = 25
+
+
+def build_tree(root: Path) -> dict:
+    """Synthetic tree of badly named files; returns expected path → content"""
+    expected = {}
+    (root / 'netlify.toml').write_text("[build]\npublish = 'dist'")
+    for d in range(DIRECTORIES):
+        directory = root / f'section-{d}'
+        directory.mkdir()
+        for f in range(FILES_PER_DIRECTORY):
+            content = f"console.log('{d}/{f}');"
+            (directory / f'Bad File {f}.js').write_text(content)
+            expected[f'section-{d}/bad-file-{f}.js'] = content
+    return expected
+
+
+def run_pipeline(args):
+    """One full analyze + heal pass, started in lockstep with the others"""
+    root, lock_dir, barrier = args
+    logging.disable(logging.CRITICAL)
+    kb = KnowledgeBase()
+    analyzer = ProjectAnalyzer(kb)
+    healer = FileHealer(kb, DirectoryLocks(root, lock_dir=lock_dir, timeout=30))
+
+    issues = analyzer.analyze_project(Path(root))
+    barrier.wait()
+    report = healer.heal_project(Path(root), issues)
+    return len(report['renamed_files']), report['errors']
+
+
+def test_concurrent_pipelines():
+    """Every file is healed exactly once with its content intact"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        root = Path(tmpdir) / 'repo'
+        root.mkdir()
+        lock_dir = Path(tmpdir) / 'locks'
+        expected = build_tree(root)
+
+        print(f"🧪 Running {PIPELINES} pipelines against {len(expected)} files...")
+        manager = multiprocessing.Manager()
+        barrier = manager.Barrier(PIPELINES)
+        with multiprocessing.Pool(PIPELINES) as pool:
+            results = pool.map(run_pipeline, [(str(root), str(lock_dir), barrier)] * PIPELINES)
+
+        renamed = sum(count for count, _ in results)
+        errors = [error for _, errs in results for error in errs]
+        files = {p.relative_to(root).as_posix(): p.read_text()
+                 for p in root.rglob('*.js')}
+
+        ok = True
+        if errors:
+            print(f"   ❌ Errors: {errors[:5]}")
+            ok = False
+        if renamed != len(expected):
+            print(f"   ❌ {renamed} renames for {len(expected)} files")
+            ok = False
+        if files != expected:
+            print(f"   ❌ Final tree differs: {sorted(set(files) ^ set(expected))[:5]}")
+            ok = False
+        if ok:
+            print(f"   ✅ {renamed} files healed exactly once, content preserved")
+        return ok
+
+
+def test_no_clobber():
+    """Two files healing to the same name never overwrite each other"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        root = Path(tmpdir) / 'repo'
+        root.mkdir()
+        (root / 'netlify.toml').write_text('')
+        (root / 'Hero Banner.js').write_text('AAA')
+        (root / 'hero_banner.js').write_text('BBB')
+
+        kb = KnowledgeBase()
+        healer = FileHealer(kb, DirectoryLocks(root, lock_dir=Path(tmpdir) / 'locks'))
+        report = healer.heal_project(root, ProjectAnalyzer(kb).analyze_project(root))
+
+        contents = sorted(p.read_text() for p in root.glob('*.js'))
+        if contents == ['AAA', 'BBB'] and len(report['renamed_files']) == 1 and len(report['errors']) == 1:
+            print("   ✅ Rename onto an existing file refused and reported")
+            return True
+        print(f"   ❌ Contents {contents}, report {report}")
+        return False
+
+
+def exit_immediately():
+    pass
+
+
+def die_holding_lock(root, lock_dir):
+    """Take a lock and exit without releasing it"""
+    with DirectoryLocks(root, lock_dir=lock_dir).lock(Path(root)):
+        os._exit(0)
+
+
+def hold_lock(path, owner):
+    """Hold ``path`` the way a forked child of a dead owner would"""
+    fd = os.open(path, os.O_RDWR | os.O_CREAT)
+    fcntl.flock(fd, fcntl.LOCK_EX)
+    os.write(fd, json.dumps(owner).encode())
+    return fd
+
+
+def test_stale_lock():
+    """A crashed owner's lock is free; one a dead owner's child holds is reported, not broken"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        lock_dir = Path(tmpdir) / 'locks'
+        locks = DirectoryLocks(tmpdir, lock_dir=lock_dir, timeout=0.5)
+        ok = True
+
+        # The kernel drops the flock of a process that dies holding it
+        crashed = multiprocessing.Process(target=die_holding_lock, args=(tmpdir, str(lock_dir)))
+        crashed.start()
+        crashed.join()
+        try:
+            with locks.lock(Path(tmpdir)):
+                print("   ✅ Lock of a crashed owner is free")
+        except LockTimeout as e:
+            print(f"   ❌ Crashed owner's lock still held: {e}")
+            ok = False
+
+        if locks.identity['pid_ns'] is None:
+            print("   ⏭️  No /proc here, dead owners can't be detected")
+            return ok
+
+        dead = multiprocessing.Process(target=exit_immediately)
+        dead.start()
+        dead.join()
+        path = locks.lock_path(Path(tmpdir))
+
+        # A live process still holds it for a dead owner: reported, never broken
+        fd = hold_lock(path, dict(locks.identity, pid=dead.pid))
+        try:
+            with locks.lock(Path(tmpdir)):
+                print("   ❌ Broke a lock that is still held")
+                ok = False
+        except LockTimeout as e:
+            if 'stale' in str(e):
+                print("   ✅ Stale lock detected and reported, not broken")
+            else:
+                print(f"   ❌ Stale lock not reported: {e}")
+                ok = False
+        finally:
+            os.close(fd)
+
+        # Another container with the same hostname: its PIDs mean nothing here
+        fd = hold_lock(path, dict(locks.identity, pid=dead.pid, pid_ns=-1))
+        try:
+            with locks.lock(Path(tmpdir)):
+                print("   ❌ Broke a lock from another PID namespace")
+                ok = False
+        except LockTimeout as e:
+            if 'stale' in str(e):
+                print(f"   ❌ Owner in another PID namespace reported dead: {e}")
+                ok = False
+            else:
+                print("   ✅ Lock from another PID namespace not reported stale")
+        finally:
+            os.close(fd)
+        return ok
+
+
+if __name__ == "__main__":
+    success = test_concurrent_pipelines() & test_no_clobber() & test_stale_lock()
+    exit(0 if success else 1)
@@ -97,6 +97,21 @@ def test_file_healing():
         
         return all_fixed
 
+def test_missing_netlify_toml():
+    """A missing netlify.toml is reported once, however many root files there are"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tmpdir_path = Path(tmpdir)
+        (tmpdir_path / "index.html").write_text("")
+        (tmpdir_path / "about.html").write_text("")
+        
+        issues = ProjectAnalyzer(KnowledgeBase()).analyze_project(tmpdir_path)
+        missing = [i['file'] for i in issues['missing_files']]
+        if missing == ['netlify.toml']:
+            print("   ✅ Missing netlify.toml reported once")
+            return True
+        print(f"   ❌ Missing files: {missing}")
+        return False
+
 if __name__ == "__main__":
-    success = test_file_healing()
+    success = test_file_healing() & test_missing_netlify_toml()
     exit(0 if success else 1)
\ No newline at end of file
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Healing history test: recording, per-repo accept and query scoping
+"""
+import logging
+import multiprocessing
+import os
+import sqlite3
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from src.healer.project_analyzer import ProjectAnalyzer
+from src.rag.knowledge_base import KnowledgeBase
+from src.utils.history import HealingHistory
+
+MAIN = Path(__file__).parent / 'main.py'
+WRITERS = 6
+RUNS_PER_WRITER = 10
+
+
+def fake_run(repo: Path, name: str):
+    """Issues and a healing report renaming one file in ``repo``"""
+    issues = {'invalid_filenames': [{'path': str(repo / name), 'suggestion': 'fixed.js', 'reason': 'x'}]}
+    report = {'renamed_files': [{'from': str(repo / name), 'to': str(repo / 'fixed.js')}], 'errors': []}
+    return issues, report
+
+
+def write_runs(args):
+    db_path, repo = args
+    logging.disable(logging.CRITICAL)
+    history = HealingHistory(db_path)
+    for _ in range(RUNS_PER_WRITER):
+        issues, report = fake_run(Path(repo), 'Bad.js')
+        history.record_run(Path(repo), issues, report, {'total': 0.1}, 'healed')
+
+
+def test_record_and_query(tmpdir: Path):
+    """Runs are stored relative to their repo and queries stay per repo"""
+    history = HealingHistory(tmpdir / 'history.db')
+    repo_a, repo_b = tmpdir / 'a', tmpdir / 'b'
+    for repo in (repo_a, repo_b):
+        repo.mkdir()
+    history.record_run(repo_a, *fake_run(repo_a, 'Bad.js'), {'total': 2.0}, 'healed')
+    history.record_run(repo_a, *fake_run(repo_a, 'Bad.js'), {'total': 1.0}, 'healed')
+    history.record_run(repo_b, *fake_run(repo_b, 'Other.js'), {'total': 3.0}, 'healed')
+
+    ok = True
+    if history.most_healed_paths(repo_a) != [{'path': 'Bad.js', 'times': 2}]:
+        print(f"   ❌ most_healed_paths(a): {history.most_healed_paths(repo_a)}")
+        ok = False
+    if history.most_healed_paths(repo_b) != [{'path': 'Other.js', 'times': 1}]:
+        print(f"   ❌ most_healed_paths(b): {history.most_healed_paths(repo_b)}")
+        ok = False
+    if [row['total_seconds'] for row in history.slowest_runs(2)] != [3.0, 2.0]:
+        print(f"   ❌ slowest_runs: {history.slowest_runs(2)}")
+        ok = False
+
+    history.accept(repo_a, 'index.html')
+    if history.accepted_paths(repo_a) != {'index.html'} or history.accepted_paths(repo_b):
+        print("   ❌ Accepted exception leaked across repos")
+        ok = False
+    if ok:
+        print("   ✅ Runs recorded; accept and queries scoped per repo")
+    return ok
+
+
+def test_accepted_root_file(tmpdir: Path):
+    """An accepted root file is skipped but still triggers required-file checks"""
+    repo = tmpdir / 'site'
+    repo.mkdir()
+    (repo / 'Legacy Page.html').write_text('')
+    history = HealingHistory(tmpdir / 'history.db')
+    history.accept(repo, 'Legacy Page.html')
+
+    issues = ProjectAnalyzer(KnowledgeBase(), history=history).analyze_project(repo)
+    ok = 'invalid_filenames' not in issues and [i['file'] for i in issues.get('missing_files', [])] == ['netlify.toml']
+    print("   ✅ Accepted file skipped, missing netlify.toml still reported" if ok
+          else f"   ❌ Unexpected issues: {issues}")
+    return ok
+
+
+def test_db_inside_repo(tmpdir: Path):
+    """A history db kept in the repo is neither analyzed nor committed"""
+    repo = tmpdir / 'checkout'
+    repo.mkdir()
+    (repo / 'netlify.toml').write_text('')
+    (repo / 'Bad Name.js').write_text('')
+    env = dict(os.environ, GIT_AUTHOR_NAME='t', GIT_AUTHOR_EMAIL='t@t', GIT_COMMITTER_NAME='t',
+               GIT_COMMITTER_EMAIL='t@t')
+    subprocess.run(['git', 'init', '-q'], cwd=repo, check=True)
+
+    # Push fails without a remote, but the commit is made first
+    result = subprocess.run([sys.executable, str(MAIN), '--path', '.', '--history-db', 'healing-history.db',
+                             '--auto-commit', '--github-token', 'x'],
+                            cwd=repo, env=env, capture_output=True, text=True)
+    committed = subprocess.run(['git', 'ls-files'], cwd=repo, capture_output=True, text=True).stdout.split()
+    history = HealingHistory(repo / 'healing-history.db')
+    with sqlite3.connect(str(history.db_path)) as conn:
+        analyzed = [row[0] for row in conn.execute("SELECT path FROM issues")]
+
+    ok = committed == ['bad-name.js', 'netlify.toml'] and analyzed == ['Bad Name.js']
+    print("   ✅ In-repo history db not analyzed or committed" if ok
+          else f"   ❌ Committed {committed}, analyzed {analyzed}\n{result.stderr[-500:]}")
+    return ok
+
+
+def test_concurrent_writers(tmpdir: Path):
+    """Concurrent pipelines all get their runs recorded"""
+    db_path = tmpdir / 'concurrent.db'
+    HealingHistory(db_path)
+    with multiprocessing.Pool(WRITERS) as pool:
+        pool.map(write_runs, [(str(db_path), str(tmpdir))] * WRITERS)
+
+    conn = sqlite3.connect(str(db_path))
+    runs = conn.execute("SELECT COUNT(*) FROM runs").fetchone()[0]
+    renames = conn.execute("SELECT COUNT(*) FROM renames").fetchone()[0]
+    mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+    conn.close()
+    expected = WRITERS * RUNS_PER_WRITER
+    ok = runs == expected and renames == expected and mode == 'wal'
+    print(f"   ✅ {runs} runs from {WRITERS} concurrent writers" if ok
+          else f"   ❌ {runs} runs / {renames} renames (expected {expected}), journal_mode={mode}")
+    return ok
+
+
+if __name__ == "__main__":
+    logging.disable(logging.CRITICAL)
+    print("🧪 Testing healing history...")
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tmpdir = Path(tmpdir)
+        success = (test_record_and_query(tmpdir) & test_accepted_root_file(tmpdir)
+                   & test_db_inside_repo(tmpdir) & test_concurrent_writers(tmpdir))
+    exit(0 if success else 1)
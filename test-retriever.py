@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Name index test: scoring vs brute force, suggestions, budget and concurrent builds
+"""
+import logging
+import random
+import string
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from src.rag.knowledge_base import KnowledgeBase
+from src.rag.retriever import NameIndex
+
+MAIN = Path(__file__).parent / 'main.py'
+PIPELINES = 8
+
+
+def random_names(count: int, seed: int = 0) -> list:
+    rng = random.Random(seed)
+    words = [''.join(rng.choices(string.ascii_lowercase, k=rng.randint(2, 7))) for _ in range(200)]
+    return ['-'.join(rng.sample(words, rng.randint(1, 3))) + rng.choice(['.png', '.js', '.css'])
+            for _ in range(count)]
+
+
+def brute_force(index: NameIndex, query: str) -> dict:
+    """Dense TF-IDF cosine of ``query`` against every same-extension name"""
+    def vector(name):
+        v = np.zeros(len(index.vocab) + 1)
+        for gram, count in NameIndex.grams(name, index.n).items():
+            if gram in index.vocab:
+                v[index.vocab[gram]] += count * index.idf[index.vocab[gram]]
+            else:
+                # Unseen grams share one slot, weighted at the max idf
+                v[-1] = np.hypot(v[-1], count * (np.log(1 + len(index.names)) + 1))
+        return v / (np.linalg.norm(v) or 1.0)
+
+    q = vector(query)
+    ext = Path(query).suffix.lower()
+    return {name: float(q @ vector(name)) for name in index.names
+            if Path(name).suffix.lower() == ext and q @ vector(name) > 0}
+
+
+def test_matches_brute_force():
+    """Vectorized top-k equals a dense cosine computed name by name"""
+    index = NameIndex.build(random_names(400))
+    queries = random_names(60, seed=1) + ['HeroBanner.PNG', 'zzzz.js', 'x.unknown']
+    ok = True
+    for query, hits in zip(queries, index.query(queries, k=5)):
+        expected = brute_force(index, query)
+        top = sorted(expected.values(), reverse=True)[:5]
+        scores = [score for _, score in hits]
+        if not np.allclose(scores, top, atol=1e-5) or any(
+                abs(expected[name] - score) > 1e-5 for name, score in hits):
+            print(f"   ❌ {query}: got {hits}, expected scores {top}")
+            ok = False
+    if ok:
+        print(f"   ✅ {len(queries)} queries match brute-force cosine")
+    return ok
+
+
+def test_suggestions():
+    """Names follow their nearest conventional neighbour, empty index is harmless"""
+    ok = True
+    with tempfile.TemporaryDirectory() as tmpdir:
+        NameIndex.build(['hero-banner.png', 'footer.css', 'heroes-banner.png']).save(tmpdir)
+        kb = KnowledgeBase(index=NameIndex.load(tmpdir))
+        got = kb.generate_suggestions(['HeroBanner.PNG', 'HeroBanner2.PNG', 'Hero_Banner2.png',
+                                       'index.jx', 'hero-banner.png', 'FooterLinks.css'])
+        expected = ['hero-banner.png', 'hero-banner2.png', 'hero-banner2.png',
+                    'index.js', 'hero-banner.png', 'footerlinks.css']
+        if got != expected:
+            print(f"   ❌ Suggestions {got}, expected {expected}")
+            ok = False
+
+        # A near neighbour below the threshold is ignored
+        strict = KnowledgeBase(index=NameIndex.load(tmpdir), min_similarity=0.95)
+        if strict.generate_suggestions(['HeroBanner2.PNG']) != ['herobanner2.png']:
+            print("   ❌ Neighbour below min_similarity was used")
+            ok = False
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        NameIndex.build([]).save(tmpdir)
+        kb = KnowledgeBase(index=NameIndex.load(tmpdir))
+        if kb.generate_suggestions(['HeroBanner.PNG']) != ['herobanner.png']:
+            print("   ❌ Empty index changed suggestions")
+            ok = False
+    if ok:
+        print("   ✅ Nearest conventional names followed; empty index falls back to rules")
+    return ok
+
+
+def test_budget():
+    """An impossible budget stops after the first lookup"""
+    index = NameIndex.build(random_names(400))
+    queries = random_names(50, seed=2)
+    results = index.query(queries, budget_ms=1e-9)
+    answered = sum(1 for hits in results if hits)
+    ok = answered <= 1 and index.stats['over_budget'] == len(queries) - 1
+    print(f"   ✅ Budget enforced from the first lookup" if ok
+          else f"   ❌ {answered} lookups answered, stats {index.stats}")
+    return ok
+
+
+def test_concurrent_builds():
+    """N pipelines sharing a missing index all load a complete one"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        root = Path(tmpdir) / 'repo'
+        root.mkdir()
+        (root / 'netlify.toml').write_text('')
+        for name in random_names(300):
+            (root / name).write_text('')
+        (root / 'HeroBanner.PNG').write_text('')
+        index_dir = Path(tmpdir) / 'index'
+
+        procs = [subprocess.Popen([sys.executable, str(MAIN), '--path', str(root),
+                                   '--rag-index', str(index_dir)],
+                                  stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+                 for _ in range(PIPELINES)]
+        failures = [proc.communicate()[1] for proc in procs if proc.wait() != 0]
+        if failures:
+            print(f"   ❌ {len(failures)} of {PIPELINES} pipelines failed:\n{failures[0][-500:]}")
+            return False
+        print(f"   ✅ {PIPELINES} concurrent pipelines built/loaded one index")
+        return True
+
+
+def test_index_inside_repo():
+    """An index kept in the tree it serves survives being healed twice"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        root = Path(tmpdir)
+        (root / 'netlify.toml').write_text('')
+        (root / 'hero-banner.png').write_text('')
+        (root / 'HeroBanner2.PNG').write_text('')
+
+        def run(*args):
+            return subprocess.run([sys.executable, str(MAIN), '--path', str(root), '--rag-index', 'idx', *args],
+                                  cwd=root, capture_output=True, text=True)
+
+        dry = run('--dry-run')
+        ok = dry.returncode == 0 and not (root / 'idx').exists()
+        if not ok:
+            print(f"   ❌ Dry run failed or wrote the index:\n{dry.stderr[-500:]}")
+
+        for attempt in (1, 2):
+            result = run()
+            if result.returncode != 0:
+                print(f"   ❌ Run {attempt} failed:\n{result.stderr[-500:]}")
+                return False
+        files = sorted(p.name for p in (root / 'idx').iterdir())
+        if files != sorted([NameIndex.filename(n) for n in NameIndex.FILES + ('idf',)] + ['meta.json']):
+            print(f"   ❌ Index files were touched: {files}")
+            ok = False
+        if ok:
+            print("   ✅ In-repo index left alone across runs, dry run writes nothing")
+        return ok
+
+
+if __name__ == "__main__":
+    logging.disable(logging.CRITICAL)
+    print("🧪 Testing name index...")
+    success = (test_matches_brute_force() & test_suggestions() & test_budget()
+               & test_concurrent_builds() & test_index_inside_repo())
+    exit(0 if success else 1)
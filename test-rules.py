@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Rule dispatcher test: scoping, stats, duplicate names and plugin loading
+"""
+import logging
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from src.healer.file_healer import FileHealer
+from src.healer.project_analyzer import ProjectAnalyzer
+from src.healer.rules import Rule, RuleDispatcher, load_plugin_rules, ENTRY_POINT_GROUP
+from src.rag.knowledge_base import KnowledgeBase
+
+PLUGIN_MODULE = '''
+from src.healer.rules import Rule
+
+class NoTmpRule(Rule):
+    extensions = ('.tmp',)
+
+    def check(self, rel_path):
+        return [self.violation(rel_path, 'No temp files')]
+
+class ShadowRule(NoTmpRule):
+    name = "no-ds-store"
+'''
+
+
+class Flag(Rule):
+    """Flags every file it is dispatched"""
+    def __init__(self, name, **scope):
+        super().__init__()
+        self.name = name
+        for key, value in scope.items():
+            setattr(self, key, value)
+
+    def check(self, rel_path):
+        return [self.violation(rel_path, 'flagged')]
+
+
+def test_scoping():
+    """Files only reach rules whose extension, filename and path scope match"""
+    dispatcher = RuleDispatcher([
+        Flag('any'),
+        Flag('images', extensions=('.png',)),
+        Flag('ds-store', filenames=('.DS_Store',)),
+        Flag('assets-css', extensions=('.css',), paths=('assets/',)),
+        Flag('src-js', extensions=('.js',), paths=('src',)),
+        Flag('favicon', filenames=('favicon.ico',), extensions=('.ICO',)),
+    ])
+    cases = {
+        'index.html': ['any'],
+        'img/logo.PNG': ['images', 'any'],
+        'docs/.DS_Store': ['ds-store', 'any'],
+        'assets/site.css': ['assets-css', 'any'],
+        'src/site.css': ['any'],
+        'src/app.js': ['src-js', 'any'],
+        'srcfoo/app.js': ['any'],
+        'favicon.ico': ['favicon', 'any'],
+    }
+    ok = True
+    for rel_path, expected in cases.items():
+        got = [rule.name for rule in dispatcher.rules_for(rel_path)]
+        if got != expected:
+            print(f"   ❌ {rel_path}: expected {expected}, got {got}")
+            ok = False
+        dispatcher.check(rel_path)
+
+    stats = {row['rule']: row for row in dispatcher.report()}
+    if stats['any']['calls'] != len(cases) or stats['images']['hits'] != 1 or stats['assets-css']['calls'] != 1:
+        print(f"   ❌ Unexpected stats: {stats}")
+        ok = False
+    if ok:
+        print("   ✅ Rules dispatched by extension, filename and path")
+    return ok
+
+
+def test_ds_store_not_renamed():
+    """A .DS_Store is reported, and not renamed to .ds-store out of the rule's sight"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        root = Path(tmpdir)
+        (root / 'netlify.toml').write_text('')
+        (root / 'assets').mkdir()
+        for directory in (root, root / 'assets'):
+            (directory / '.DS_Store').write_text('')
+            (directory / 'Bad Name.js').write_text('')
+
+        kb = KnowledgeBase()
+        issues = ProjectAnalyzer(kb, RuleDispatcher.default(kb, plugins=False)).analyze_project(root)
+        FileHealer(kb).heal_project(root, issues)
+        reanalyzed = ProjectAnalyzer(kb, RuleDispatcher.default(kb, plugins=False)).analyze_project(root)
+
+    flagged = sorted(v['file'] for v in reanalyzed.get('rule_violations', []))
+    renamed = sorted(i['original_name'] for i in issues.get('invalid_filenames', []))
+    ok = flagged == ['.DS_Store', 'assets/.DS_Store'] and renamed == ['Bad Name.js', 'Bad Name.js']
+    print("   ✅ .DS_Store still flagged after healing, never renamed" if ok
+          else f"   ❌ Flagged after heal {flagged}, renamed {renamed}")
+    return ok
+
+
+def test_duplicate_names():
+    """Two rules sharing a name would merge their stats, so they are rejected"""
+    try:
+        RuleDispatcher([Flag('same'), Flag('same')])
+    except ValueError:
+        print("   ✅ Duplicate rule names rejected")
+        return True
+    print("   ❌ Duplicate rule names accepted")
+    return False
+
+
+def test_plugins():
+    """Entry point plugins load, get named, and can't shadow built-ins"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tmpdir = Path(tmpdir)
+        (tmpdir / 'org_rules.py').write_text(PLUGIN_MODULE)
+        dist_info = tmpdir / 'org_rules-1.0.dist-info'
+        dist_info.mkdir()
+        (dist_info / 'METADATA').write_text('Metadata-Version: 2.1\nName: org-rules\nVersion: 1.0\n')
+        (dist_info / 'entry_points.txt').write_text(
+            f'[{ENTRY_POINT_GROUP}]\nno-tmp = org_rules:NoTmpRule\nshadow = org_rules:ShadowRule\n'
+        )
+        sys.path.insert(0, str(tmpdir))
+        try:
+            kb = KnowledgeBase()
+            names = sorted(rule.name for rule in load_plugin_rules(kb))
+            dispatcher = RuleDispatcher.default(kb)
+            violations = dispatcher.check('build/cache.tmp')
+        finally:
+            sys.path.remove(str(tmpdir))
+
+    ok = True
+    if names != ['no-ds-store', 'no-tmp']:
+        print(f"   ❌ Unexpected plugin names: {names}")
+        ok = False
+    if sum(rule.name == 'no-ds-store' for rule in dispatcher.rules) != 1:
+        print("   ❌ Plugin shadowed a built-in rule")
+        ok = False
+    if [v['rule'] for v in violations] != ['no-tmp']:
+        print(f"   ❌ Plugin rule did not run: {violations}")
+        ok = False
+    if ok:
+        print("   ✅ Plugins loaded via entry points")
+    return ok
+
+
+if __name__ == "__main__":
+    logging.disable(logging.CRITICAL)
+    print("🧪 Testing rule dispatcher...")
+    success = test_scoping() & test_ds_store_not_renamed() & test_duplicate_names() & test_plugins()
+    exit(0 if success else 1)
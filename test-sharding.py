@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Sharding test: N main.py processes over one checkout, then a merge
+"""
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from src.healer.sharding import ShardError, merge_partials, tree_fingerprint
+
+MAIN = Path(__file__).parent / 'main.py'
+SHARDS = 4
+
+
+def build_tree(root: Path) -> dict:
+    """Badly named files spread over many top-level dirs; returns expected tree"""
+    expected = {'netlify.toml': "[build]\npublish = 'dist'"}
+    (root / 'netlify.toml').write_text(expected['netlify.toml'])
+    for d in range(12):
+        directory = root / f'Section {d}' / 'nested'
+        directory.mkdir(parents=True)
+        for f in range(5):
+            content = f"console.log('{d}/{f}');"
+            (directory / f'My File_{f}.js').write_text(content)
+            expected[f'Section {d}/nested/my-file-{f}.js'] = content
+    for f in range(3):
+        (root / f'Root File {f}.css').write_text(f'/* {f} */')
+        expected[f'root-file-{f}.css'] = f'/* {f} */'
+    return expected
+
+
+def run_shards(root: Path, shard_dir: Path, mode: str, run_id: str = 'run-1', shards=range(SHARDS)):
+    """Analyze every shard in its own process, all at once"""
+    procs = [subprocess.Popen([sys.executable, str(MAIN), '--path', str(root),
+                               '--shard', f'{i}/{SHARDS}', '--shard-by', mode,
+                               '--shard-dir', str(shard_dir), '--shard-run-id', run_id],
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+             for i in shards]
+    return all(proc.wait() == 0 for proc in procs)
+
+
+def merge(root: Path, shard_dir: Path, run_id: str = 'run-1'):
+    return subprocess.run([sys.executable, str(MAIN), '--path', str(root),
+                           '--merge-shards', str(shard_dir), '--shard-run-id', run_id],
+                          capture_output=True, text=True)
+
+
+def test_sharded_heal():
+    """Shards cover the tree exactly once and the merge heals everything"""
+    ok = True
+    for mode in ('top', 'path'):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir) / 'repo'
+            root.mkdir()
+            shard_dir = Path(tmpdir) / 'shards'
+            expected = build_tree(root)
+
+            print(f"🧪 {SHARDS} shards by {mode}...")
+            if not run_shards(root, shard_dir, mode):
+                print("   ❌ A shard process failed")
+                ok = False
+                continue
+
+            result = merge(root, shard_dir)
+            files = {p.relative_to(root).as_posix(): p.read_text()
+                     for p in root.rglob('*') if p.is_file()}
+            if result.returncode != 0 or files != expected:
+                print(f"   ❌ Merge failed or tree differs:\n{result.stdout[-500:]}")
+                ok = False
+            else:
+                print(f"   ✅ {len(expected) - 1} files healed after merge")
+    return ok
+
+
+def test_cross_shard_collision():
+    """Two files healing to the same name are caught at merge time"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        root = Path(tmpdir) / 'repo'
+        root.mkdir()
+        shard_dir = Path(tmpdir) / 'shards'
+        (root / 'netlify.toml').write_text('')
+        # Both become hero-banner.js; with many names some land on different shards
+        for i in range(8):
+            (root / f'Hero Banner{i}.js').write_text('a')
+            (root / f'hero_banner{i}.js').write_text('b')
+
+        run_shards(root, shard_dir, 'path')
+        result = merge(root, shard_dir)
+        untouched = all((root / f'Hero Banner{i}.js').exists() for i in range(8))
+        if result.returncode != 0 and 'collision' in result.stdout and untouched:
+            print("   ✅ Collisions detected, tree left untouched")
+            return True
+        print(f"   ❌ Collisions not detected:\n{result.stdout[-500:]}")
+        return False
+
+
+def test_stale_partials():
+    """Partials left over from an earlier run are refused"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        root = Path(tmpdir) / 'repo'
+        root.mkdir()
+        shard_dir = Path(tmpdir) / 'shards'
+        build_tree(root)
+
+        run_shards(root, shard_dir, 'top', run_id='old')
+        run_shards(root, shard_dir, 'top', run_id='new', shards=[0])
+        result = merge(root, shard_dir, run_id='new')
+        untouched = (root / 'Root File 0.css').exists()
+        if result.returncode != 0 and 'different tree or run' in result.stdout + result.stderr and untouched:
+            print("   ✅ Stale partials refused")
+            return True
+        print(f"   ❌ Stale partials merged:\n{result.stdout[-500:]}")
+        return False
+
+
+def test_rename_chains():
+    """A target renamed away in the same plan isn't a collision and moves first"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        root = Path(tmpdir)
+        (root / 'a.js').write_text('')
+        (root / 'b.js').write_text('')
+
+        def partial(shard, steps):
+            issues = {'invalid_filenames': [{'path': f, 'suggestion': t} for f, t in steps]}
+            return {'shard': shard, 'plan': [{'from': f, 'to': t} for f, t in steps], 'issues': issues}
+
+        # a.js -> b.js needs b.js -> c.js to happen first
+        issues, collisions = merge_partials([partial('0/2', [('a.js', 'b.js')]),
+                                             partial('1/2', [('b.js', 'c.js')])], root)
+        order = [Path(item['path']).name for item in issues['invalid_filenames']]
+        ok = not collisions and order == ['b.js', 'a.js']
+
+        # a.js <-> b.js can't be ordered
+        _, collisions = merge_partials([partial('0/2', [('a.js', 'b.js')]),
+                                        partial('1/2', [('b.js', 'a.js')])], root)
+        ok = ok and [c['reason'] for c in collisions] == ['Renames form a cycle']
+        print("   ✅ Rename chains ordered, cycles reported" if ok
+              else f"   ❌ order {order}, collisions {collisions}")
+        return ok
+
+
+def test_shard_dir_inside_repo():
+    """Partials written inside the repo are neither analyzed nor committed"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        root = Path(tmpdir)
+        shard_dir = root / 'shards'
+        expected = build_tree(root)
+        env = dict(os.environ, GIT_AUTHOR_NAME='t', GIT_AUTHOR_EMAIL='t@t', GIT_COMMITTER_NAME='t',
+                   GIT_COMMITTER_EMAIL='t@t')
+        for command in (['init', '-q'], ['add', '.'], ['commit', '-qm', 'init']):
+            subprocess.run(['git', *command], cwd=root, env=env, check=True)
+
+        run_shards(root, shard_dir, 'top')
+        # Push fails without a remote, but the commit is made first
+        result = subprocess.run([sys.executable, str(MAIN), '--path', str(root), '--merge-shards',
+                                 str(shard_dir), '--shard-run-id', 'run-1', '--auto-commit',
+                                 '--github-token', 'x'], cwd=root, env=env, capture_output=True, text=True)
+        committed = set(subprocess.run(['git', 'ls-files'], cwd=root, capture_output=True,
+                                       text=True).stdout.splitlines())
+        if result.returncode == 0 and committed == set(expected):
+            print("   ✅ In-repo shard dir not analyzed or committed")
+            return True
+        print(f"   ❌ Committed {sorted(committed - set(expected))}:\n{result.stdout[-500:]}")
+        return False
+
+
+def test_fingerprint_without_git():
+    """No git binary is like no checkout: fine with a run id, an error without"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.environ['PATH']
+        os.environ['PATH'] = tmpdir
+        try:
+            ok = tree_fingerprint(Path(tmpdir), 'run-1') == {'head': None, 'run_id': 'run-1'}
+            try:
+                tree_fingerprint(Path(tmpdir))
+                ok = False
+            except ShardError:
+                pass
+        finally:
+            os.environ['PATH'] = path
+    print("   ✅ Missing git treated as no checkout" if ok
+          else "   ❌ Missing git not handled")
+    return ok
+
+
+if __name__ == "__main__":
+    success = (test_sharded_heal() & test_cross_shard_collision() & test_stale_partials()
+               & test_rename_chains() & test_shard_dir_inside_repo() & test_fingerprint_without_git())
+    exit(0 if success else 1)